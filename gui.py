@@ -7,16 +7,26 @@ from tkinter import messagebox
 
 from sudoku_csp import SudokuCSP, solve_puzzle
 
+CELL_SIZE = 40
+BOARD_SIZE = 9 * CELL_SIZE
+BOARD_PAD = 2  # room for the outer block border
+ARROW_MOVES = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1)}
+
 
 class SudokuGUI:
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         self.root.title("Sudoku (CSP)")
 
-        self.entries: list[list[tk.Entry]] = []
+        # Canvas text item of every cell, indexed by r * 9 + c
+        self.cell_texts: list[int] = []
+        self.selected: int | None = None
         self.solution_grid: list[list[int]] | None = None
         self.autoplay_running: bool = False
-        self.status_var = tk.StringVar(value="Enter a puzzle, then click Next Step.")
+        # Cells auto-play still has to fill, as (flat index, digit), and the next one to write
+        self._autoplay_steps: list[tuple[int, int]] = []
+        self._autoplay_idx: int = 0
+        self.status_var = tk.StringVar(value="Click a cell and type a digit to enter a puzzle, then click Next Step.")
 
         container = tk.Frame(root, padx=10, pady=10)
         container.pack()
@@ -29,38 +39,41 @@ class SudokuGUI:
     # ------------------------------------------------------------------
 
     def _build_grid(self, parent: tk.Widget) -> None:
-        for r in range(9):
-            row_entries: list[tk.Entry] = []
-            for c in range(9):
-                frame = tk.Frame(
-                    parent,
-                    bd=1,
-                    relief="solid",
-                    highlightthickness=0,
-                )
-
-                # Thicker borders between 3x3 blocks
-                top = 2 if r in (0, 3, 6) else 1
-                left = 2 if c in (0, 3, 6) else 1
-                bottom = 2 if r == 8 else 1
-                right = 2 if c == 8 else 1
-
-                frame.grid(
-                    row=r,
-                    column=c,
-                    padx=(left, right),
-                    pady=(top, bottom),
-                )
-
-                entry = tk.Entry(
-                    frame,
-                    width=2,
-                    justify="center",
-                    font=("Segoe UI", 14),
-                )
-                entry.pack(padx=1, pady=1)
-                row_entries.append(entry)
-            self.entries.append(row_entries)
+        size = BOARD_SIZE + 2 * BOARD_PAD
+        self.canvas = tk.Canvas(
+            parent, width=size, height=size, bg="white", highlightthickness=0
+        )
+        self.canvas.pack()
+
+        # Drawn first so it sits underneath the cell outlines and digits
+        self._selection_rect = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="#cce5ff", outline=""
+        )
+
+        for i in range(81):
+            r, c = divmod(i, 9)
+            x0 = BOARD_PAD + c * CELL_SIZE
+            y0 = BOARD_PAD + r * CELL_SIZE
+            self.canvas.create_rectangle(
+                x0, y0, x0 + CELL_SIZE, y0 + CELL_SIZE, outline="#999999"
+            )
+            text_id = self.canvas.create_text(
+                x0 + CELL_SIZE // 2,
+                y0 + CELL_SIZE // 2,
+                text="",
+                font=("Segoe UI", 14),
+                tags=(f"cell_{i}",),
+            )
+            self.cell_texts.append(text_id)
+
+        # Thicker borders between 3x3 blocks
+        for k in range(0, 10, 3):
+            pos = BOARD_PAD + k * CELL_SIZE
+            self.canvas.create_line(pos, BOARD_PAD, pos, BOARD_PAD + BOARD_SIZE, width=2)
+            self.canvas.create_line(BOARD_PAD, pos, BOARD_PAD + BOARD_SIZE, pos, width=2)
+
+        self.canvas.bind("<Button-1>", self._on_canvas_click)
+        self.canvas.bind("<Key>", self._on_canvas_key)
 
     def _build_controls(self, parent: tk.Widget) -> None:
         btn_frame = tk.Frame(parent, pady=10)
@@ -85,36 +98,33 @@ class SudokuGUI:
     # Helpers
     # ------------------------------------------------------------------
 
+    def _set_cell(self, i: int, text: str) -> None:
+        self.canvas.itemconfigure(self.cell_texts[i], text=text)
+
+    def _select_cell(self, i: int) -> None:
+        self.selected = i
+        r, c = divmod(i, 9)
+        x0 = BOARD_PAD + c * CELL_SIZE
+        y0 = BOARD_PAD + r * CELL_SIZE
+        self.canvas.coords(self._selection_rect, x0, y0, x0 + CELL_SIZE, y0 + CELL_SIZE)
+
     def _read_puzzle_from_ui(self) -> str:
-        chars: list[str] = []
-        for r in range(9):
-            for c in range(9):
-                text = self.entries[r][c].get().strip()
-                if text in ("", ".", "0"):
-                    chars.append(".")
-                elif text.isdigit() and text != "0":
-                    chars.append(text[0])
-                else:
-                    # Invalid char, treat as empty
-                    chars.append(".")
-        return "".join(chars)
+        # _on_canvas_key only ever stores "" or a single digit 1-9
+        itemcget = self.canvas.itemcget
+        return "".join(itemcget(t, "text") or "." for t in self.cell_texts)
 
     def _write_grid_to_ui(self, grid: list[list[int]]) -> None:
         for r in range(9):
             for c in range(9):
                 val = grid[r][c]
-                self.entries[r][c].delete(0, tk.END)
-                if val != 0:
-                    self.entries[r][c].insert(0, str(val))
+                self._set_cell(r * 9 + c, str(val) if val != 0 else "")
 
     def _read_grid_from_ui(self) -> list[list[int]]:
-        grid: list[list[int]] = [[0 for _ in range(9)] for _ in range(9)]
-        for r in range(9):
-            for c in range(9):
-                text = self.entries[r][c].get().strip()
-                if text.isdigit() and text != "0":
-                    grid[r][c] = int(text[0])
-        return grid
+        puzzle = self._read_puzzle_from_ui()
+        return [
+            [0 if ch == "." else int(ch) for ch in puzzle[r * 9 : r * 9 + 9]]
+            for r in range(9)
+        ]
 
     def _load_puzzle_string(self, puzzle: str) -> None:
         try:
@@ -125,6 +135,29 @@ class SudokuGUI:
         grid = csp.to_grid()
         self._write_grid_to_ui(grid)
 
+    # ------------------------------------------------------------------
+    # Board input
+    # ------------------------------------------------------------------
+
+    def _on_canvas_click(self, event: tk.Event) -> None:
+        c = (event.x - BOARD_PAD) // CELL_SIZE
+        r = (event.y - BOARD_PAD) // CELL_SIZE
+        if 0 <= r < 9 and 0 <= c < 9:
+            self._select_cell(r * 9 + c)
+            self.canvas.focus_set()
+
+    def _on_canvas_key(self, event: tk.Event) -> None:
+        if self.selected is None:
+            return
+        r, c = divmod(self.selected, 9)
+        if event.keysym in ARROW_MOVES:
+            dr, dc = ARROW_MOVES[event.keysym]
+            self._select_cell(((r + dr) % 9) * 9 + (c + dc) % 9)
+        elif event.char and event.char in "123456789":
+            self._set_cell(self.selected, event.char)
+        elif event.char in ("0", ".", " ") or event.keysym in ("BackSpace", "Delete"):
+            self._set_cell(self.selected, "")
+
     # ------------------------------------------------------------------
     # Button callbacks
     # ------------------------------------------------------------------
@@ -164,8 +197,7 @@ class SudokuGUI:
                 target = self.solution_grid[r][c]
                 if current_grid[r][c] != target:
                     # Fill this cell as the next AI step.
-                    self.entries[r][c].delete(0, tk.END)
-                    self.entries[r][c].insert(0, str(target))
+                    self._set_cell(r * 9 + c, str(target))
                     self.status_var.set(
                         f"Filled row {r + 1}, col {c + 1} with {target}."
                     )
@@ -201,20 +233,17 @@ class SudokuGUI:
             self.autoplay_running = False
             return
 
-        current_grid = self._read_grid_from_ui()
-
-        for r in range(9):
-            for c in range(9):
-                target = self.solution_grid[r][c]
-                if current_grid[r][c] != target:
-                    self.entries[r][c].delete(0, tk.END)
-                    self.entries[r][c].insert(0, str(target))
-                    self.status_var.set(
-                        f"Auto-play: filled row {r + 1}, col {c + 1} with {target}."
-                    )
-                    # Schedule next step
-                    self.root.after(120, self._autoplay_step)
-                    return
+        if self._autoplay_idx < len(self._autoplay_steps):
+            i, target = self._autoplay_steps[self._autoplay_idx]
+            self._autoplay_idx += 1
+            r, c = divmod(i, 9)
+            self._set_cell(i, str(target))
+            self.status_var.set(
+                f"Auto-play: filled row {r + 1}, col {c + 1} with {target}."
+            )
+            # Schedule next step
+            self.root.after(120, self._autoplay_step)
+            return
 
         self.autoplay_running = False
         self.status_var.set("Auto-play finished: puzzle solved.")
@@ -224,14 +253,22 @@ class SudokuGUI:
             return
         if not self._ensure_solution():
             return
+        solution = self.solution_grid
+        current_grid = self._read_grid_from_ui()
+        # Work out the remaining moves once; each tick then writes a single cell.
+        self._autoplay_steps = [
+            (i, solution[i // 9][i % 9])
+            for i in range(81)
+            if current_grid[i // 9][i % 9] != solution[i // 9][i % 9]
+        ]
+        self._autoplay_idx = 0
         self.autoplay_running = True
         self.status_var.set("Auto-play started...")
         self._autoplay_step()
 
     def on_clear(self) -> None:
-        for r in range(9):
-            for c in range(9):
-                self.entries[r][c].delete(0, tk.END)
+        for i in range(81):
+            self._set_cell(i, "")
         self.solution_grid = None
         self.autoplay_running = False
         self.status_var.set("Board cleared. Enter a puzzle, then click Next Step or Start Auto-Play.")
@@ -9,8 +9,8 @@ import matplotlib.pyplot as plt
 from sudoku_csp import SudokuCSP
 
 
-def make_step_visualizer() -> Callable[[int, List[List[int]]], None]:
-    
+def make_step_visualizer(redraw_every: int = 10) -> Callable[[int, List[List[int]]], None]:
+
     plt.ion()
     fig, ax = plt.subplots()
     fig.canvas.manager.set_window_title("Sudoku CSP Search")
@@ -31,6 +31,8 @@ def make_step_visualizer() -> Callable[[int, List[List[int]]], None]:
         for r in range(9)
     ]
 
+    call_count = [0]
+
     def step_visualizer(step: int, grid: List[List[int]]) -> None:
         ax.set_title(f"Sudoku CSP search – step {step}")
         im.set_data(grid)
@@ -38,7 +40,13 @@ def make_step_visualizer() -> Callable[[int, List[List[int]]], None]:
             for c in range(9):
                 v = grid[r][c]
                 texts[r][c].set_text(str(v) if v != 0 else "")
-        plt.pause(0.001)
+
+        # Repaint only every `redraw_every` calls, without plt.pause()'s sleep;
+        # the final plt.show() draws whatever state the artists end up in.
+        call_count[0] += 1
+        if call_count[0] % redraw_every == 0:
+            fig.canvas.draw_idle()
+            fig.canvas.flush_events()
 
     # Return the callable that matches the solver's step_callback signature
     return step_visualizer
@@ -1,92 +1,114 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
 Coord = Tuple[int, int]  # (row, col) 0-based
+PeerTable = List[Tuple[int, ...]]  # index -> tuple of cell indices
+Trail = List[Tuple[int, int]]  # (cell index, previous mask) undo log
+
+# Domains are 9-bit masks: bit (d - 1) is set when digit d is still possible.
+ALL_DIGITS = 0x1FF
+DIGIT_TO_BIT: Dict[int, int] = {d: 1 << (d - 1) for d in range(1, 10)}
+BIT_TO_DIGIT: Dict[int, int] = {1 << i: i + 1 for i in range(9)}
+# Lookup table instead of int.bit_count(), which needs Python 3.10+.
+POPCOUNT: List[int] = [bin(m).count("1") for m in range(ALL_DIGITS + 1)]
 
 
 def _all_coords() -> List[Coord]:
     return [(r, c) for r in range(9) for c in range(9)]
 
 
-def _peers() -> Dict[Coord, Set[Coord]]:
-    coords = _all_coords()
-    peers: Dict[Coord, Set[Coord]] = {}
+def _units() -> PeerTable:
+    """The 27 units as cell-index tuples: rows 0-8, columns 9-17, boxes 18-26."""
+    rows = [tuple(r * 9 + c for c in range(9)) for r in range(9)]
+    cols = [tuple(r * 9 + c for r in range(9)) for c in range(9)]
+    boxes = [
+        tuple((br + dr) * 9 + bc + dc for dr in range(3) for dc in range(3))
+        for br in (0, 3, 6)
+        for bc in (0, 3, 6)
+    ]
+    return rows + cols + boxes
+
+
+UNITS: PeerTable = _units()
+# (row unit, column unit, box unit) of every cell, as indices into UNITS
+UNITS_OF: List[Tuple[int, int, int]] = [
+    (r, 9 + c, 18 + (r // 3) * 3 + c // 3) for r, c in _all_coords()
+]
+
+
+def _unit_peers() -> Tuple[PeerTable, PeerTable, PeerTable]:
+    """Row, column and box peers of every cell, indexed by ``r * 9 + c``."""
+    row_peers: PeerTable = []
+    col_peers: PeerTable = []
+    box_peers: PeerTable = []
+
+    for i, (row, col, box) in enumerate(UNITS_OF):
+        row_peers.append(tuple(p for p in UNITS[row] if p != i))
+        col_peers.append(tuple(p for p in UNITS[col] if p != i))
+        box_peers.append(tuple(p for p in UNITS[box] if p != i))
+    return row_peers, col_peers, box_peers
+
 
-    for r, c in coords:
-        row_peers = {(r, cc) for cc in range(9) if cc != c}
-        col_peers = {(rr, c) for rr in range(9) if rr != r}
-        br, bc = (r // 3) * 3, (c // 3) * 3
-        box_peers = {
-            (rr, cc)
-            for rr in range(br, br + 3)
-            for cc in range(bc, bc + 3)
-            if (rr, cc) != (r, c)
-        }
-        peers[(r, c)] = row_peers | col_peers | box_peers
-    return peers
+def _peers() -> PeerTable:
+    """All 20 peers of every cell as a sorted tuple, indexed by ``r * 9 + c``."""
+    return [
+        tuple(sorted(set(ROW_PEERS[i]) | set(COL_PEERS[i]) | set(BOX_PEERS[i])))
+        for i in range(81)
+    ]
 
 
-PEERS: Dict[Coord, Set[Coord]] = _peers()
+ROW_PEERS, COL_PEERS, BOX_PEERS = _unit_peers()
+PEERS: PeerTable = _peers()
+
+# Optional Numba-compiled search; the pure-Python solver is used without it.
+try:
+    import sudoku_solver_nb
+except ImportError:
+    sudoku_solver_nb = None
+
+if sudoku_solver_nb is not None:
+    _NB_PEERS, _NB_UNITS = sudoku_solver_nb.build_tables(PEERS, ROW_PEERS, COL_PEERS, BOX_PEERS)
 
 
 @dataclass
 class SudokuCSP:
-    domains: Dict[Coord, Set[int]]
+    # 81 bitmask domains, indexed by r * 9 + c
+    domains: List[int]
 
     @classmethod
     def from_string(cls, puzzle: str) -> "SudokuCSP":
-        cleaned = [ch for ch in puzzle if not ch.isspace()]
-        if len(cleaned) != 81:
-            raise ValueError("Puzzle must have exactly 81 non-whitespace characters")
-
-        domains: Dict[Coord, Set[int]] = {}
-        for idx, ch in enumerate(cleaned):
-            r, c = divmod(idx, 9)
-            if ch in "0.":
-                domains[(r, c)] = set(range(1, 10))
-            elif ch.isdigit() and ch != "0":
-                val = int(ch)
-                if not 1 <= val <= 9:
-                    raise ValueError(f"Invalid digit {ch} at position {idx}")
-                domains[(r, c)] = {val}
-            else:
-                raise ValueError(f"Invalid character {ch!r} in puzzle")
-
-        csp = cls(domains)
-        if not csp.ac3():
-            raise ValueError("Puzzle is immediately inconsistent under AC-3")
-        return csp
+        # Parsing and AC-3 are memoized; every caller gets its own copy of the domains
+        normalized = "".join(puzzle.split()).replace("0", ".")
+        return cls(_from_string_cached(normalized).domains[:])
 
     # ------------------------------------------------------------------
     # Utility methods
     # ------------------------------------------------------------------
 
     def is_solved(self) -> bool:
-        return all(len(d) == 1 for d in self.domains.values()) and self._constraints_satisfied()
+        return all(POPCOUNT[m] == 1 for m in self.domains) and self._constraints_satisfied()
 
     def _constraints_satisfied(self) -> bool:
-        for (r, c), dom in self.domains.items():
-            if len(dom) != 1:
+        domains = self.domains
+        for i, mask in enumerate(domains):
+            if POPCOUNT[mask] != 1:
                 continue
-            val = next(iter(dom))
-            for pr, pc in PEERS[(r, c)]:
-                pdom = self.domains[(pr, pc)]
-                if len(pdom) == 1 and next(iter(pdom)) == val:
+            for p in PEERS[i]:
+                if domains[p] == mask:
                     return False
         return True
 
     def to_grid(self) -> List[List[int]]:
-        grid = [[0 for _ in range(9)] for _ in range(9)]
-        for (r, c), dom in self.domains.items():
-            if len(dom) == 1:
-                grid[r][c] = next(iter(dom))
-        return grid
+        # Singleton masks map straight to their digit; anything else is unknown (0)
+        doms = self.domains
+        return [[BIT_TO_DIGIT.get(m, 0) for m in doms[r * 9 : r * 9 + 9]] for r in range(9)]
 
     def to_string(self) -> str:
-        grid = self.to_grid()
-        return "".join(str(grid[r][c]) for r in range(9) for c in range(9))
+        return "".join(str(BIT_TO_DIGIT.get(m, 0)) for m in self.domains)
 
     def pretty(self) -> str:
         grid = self.to_grid()
@@ -104,129 +126,197 @@ class SudokuCSP:
         return "\n".join(lines)
 
     def ac3(self) -> bool:
-        queue: List[Tuple[Coord, Coord]] = [
-            (xi, xj) for xi in self.domains for xj in PEERS[xi]
-        ]
+        queue: Deque[Tuple[int, int]] = deque(
+            (xi, xj) for xi in range(81) for xj in PEERS[xi]
+        )
+        # Arcs currently waiting in the queue, so re-enqueues are not duplicated
+        in_queue: Set[Tuple[int, int]] = set(queue)
 
         while queue:
-            xi, xj = queue.pop(0)
+            arc = queue.popleft()
+            in_queue.discard(arc)
+            xi, xj = arc
             if self._revise(xi, xj):
                 if not self.domains[xi]:
                     return False
-                for xk in PEERS[xi] - {xj}:
-                    queue.append((xk, xi))
+                for xk in PEERS[xi]:
+                    if xk != xj and (xk, xi) not in in_queue:
+                        queue.append((xk, xi))
+                        in_queue.add((xk, xi))
         return True
 
-    def _revise(self, xi: Coord, xj: Coord) -> bool:
-        revised = False
+    def _revise(self, xi: int, xj: int) -> bool:
         dom_i = self.domains[xi]
         dom_j = self.domains[xj]
 
-        if len(dom_j) == 1:
-            val_j = next(iter(dom_j))
-            if val_j in dom_i:
-                if len(dom_i) == 1:
-                    # Would make Xi empty; AC-3 will detect inconsistency later.
-                    return revised
-                dom_i.remove(val_j)
-                revised = True
-        return revised
+        if POPCOUNT[dom_j] == 1 and dom_i & dom_j:
+            # May leave Xi empty (two equal clues); ac3() then reports it.
+            self.domains[xi] = dom_i & ~dom_j
+            return True
+        return False
 
     def solve(
         self,
         step_callback: Optional[Callable[[int, List[List[int]]], None]] = None,
         step_interval: int = 1000,
     ) -> Optional["SudokuCSP"]:
-        domains_copy: Dict[Coord, Set[int]] = {k: set(v) for k, v in self.domains.items()}
+        # The compiled solver cannot report intermediate steps.
+        if sudoku_solver_nb is not None and step_callback is None:
+            solved = sudoku_solver_nb.solve_domains(self.domains, _NB_PEERS, _NB_UNITS)
+            if solved is None:
+                return None
+            solution = SudokuCSP(solved)
+            assert solution._constraints_satisfied()
+            return solution
+
+        domains_copy: List[int] = self.domains[:]
+        trail: Trail = []
         state = {"steps": 0}
-        result = self._backtrack(domains_copy, step_callback, step_interval, state)
+        result = self._backtrack(domains_copy, trail, step_callback, step_interval, state)
         if result is None:
             return None
         return SudokuCSP(result)
 
-    def _select_unassigned_variable(self, domains: Dict[Coord, Set[int]]) -> Optional[Coord]:
-        unassigned = [(v, d) for v, d in domains.items() if len(d) > 1]
-        if not unassigned:
-            return None
-        # Sort by domain size (MRV); tie-breaker by fixed order
-        v, _ = min(unassigned, key=lambda item: len(item[1]))
-        return v
-
-    def _order_domain_values(self, var: Coord, domains: Dict[Coord, Set[int]]) -> Sequence[int]:
-        counts: List[Tuple[int, int]] = []
-        for val in domains[var]:
-            impact = 0
-            for peer in PEERS[var]:
-                if val in domains[peer]:
-                    impact += 1
-            counts.append((val, impact))
-        # Sort by impact ascending: least constraining value first
-        counts.sort(key=lambda t: t[1])
-        return [v for v, _ in counts]
-
-    def _consistent(self, var: Coord, val: int, domains: Dict[Coord, Set[int]]) -> bool:
-        for peer in PEERS[var]:
-            d = domains[peer]
-            if len(d) == 1 and val in d:
+    def _select_unassigned_variable(self, domains: List[int]) -> Optional[int]:
+        # Smallest domain first (MRV); ties go to the lowest index
+        best: Optional[int] = None
+        best_size = 10
+        for i, mask in enumerate(domains):
+            size = POPCOUNT[mask]
+            if 1 < size < best_size:
+                best, best_size = i, size
+                if size == 2:
+                    # No unassigned domain can be smaller
+                    break
+        return best
+
+    def _assign(self, domains: List[int], trail: Trail, var: int, bit: int) -> bool:
+        """Reduce ``var`` to ``bit`` in place by eliminating every other value."""
+        others = domains[var] & ~bit
+        while others:
+            other = others & -others
+            others ^= other
+            if not self._eliminate(domains, trail, var, other):
                 return False
         return True
 
-    def _forward_check(
-        self, var: Coord, val: int, domains: Dict[Coord, Set[int]]
-    ) -> Optional[Dict[Coord, Set[int]]]:
-        new_domains: Dict[Coord, Set[int]] = {v: set(d) for v, d in domains.items()}
-        new_domains[var] = {val}
-
-        for peer in PEERS[var]:
-            if val in new_domains[peer]:
-                if len(new_domains[peer]) == 1:
-                    return None
-                new_domains[peer].remove(val)
+    def _eliminate(self, domains: List[int], trail: Trail, var: int, bit: int) -> bool:
+        """Remove ``bit`` from ``var`` and propagate; False on contradiction."""
+        mask = domains[var]
+        if not mask & bit:
+            return True
+        trail.append((var, mask))
+        mask &= ~bit
+        domains[var] = mask
+        if not mask:
+            return False
+
+        # Naked single: the remaining value can be removed from every peer.
+        if POPCOUNT[mask] == 1:
+            for peer in PEERS[var]:
+                if not self._eliminate(domains, trail, peer, mask):
+                    return False
 
-        return new_domains
+        # Hidden single: if a unit has one place left for ``bit``, put it there.
+        for unit in (ROW_PEERS[var], COL_PEERS[var], BOX_PEERS[var]):
+            places = [p for p in unit if domains[p] & bit]
+            if not places:
+                return False
+            if len(places) == 1 and not self._assign(domains, trail, places[0], bit):
+                return False
+        return True
 
     def _backtrack(
         self,
-        domains: Dict[Coord, Set[int]],
+        domains: List[int],
+        trail: Trail,
         step_callback: Optional[Callable[[int, List[List[int]]], None]],
         step_interval: int,
         state: Dict[str, int],
-    ) -> Optional[Dict[Coord, Set[int]]]:
-        state["steps"] += 1
-        if step_callback is not None and state["steps"] % step_interval == 0:
-            grid = [[0 for _ in range(9)] for _ in range(9)]
-            for (r, c), dom in domains.items():
-                if len(dom) == 1:
-                    grid[r][c] = next(iter(dom))
-            step_callback(state["steps"], grid)
-
-        if all(len(d) == 1 for d in domains.values()):
-            tmp = SudokuCSP(domains)
-            if tmp._constraints_satisfied():
+    ) -> Optional[List[int]]:
+        # Explicit search stack instead of recursion. Each frame is
+        # [trail mark, variable, values still to try as a bitmask].
+        stack: List[List[int]] = []
+        # Reused for every step_callback call; callers must not keep a reference.
+        grid_buf = [[0] * 9 for _ in range(9)]
+
+        while True:
+            # Entering a new search node
+            state["steps"] += 1
+            if step_callback is not None and state["steps"] % step_interval == 0:
+                for i, mask in enumerate(domains):
+                    grid_buf[i // 9][i % 9] = BIT_TO_DIGIT.get(mask, 0)
+                step_callback(state["steps"], grid_buf)
+
+            var = self._select_unassigned_variable(domains)
+            if var is None:
+                # Every cell is a singleton. AC-3 and _eliminate never leave two
+                # equal singletons among peers, so this is a solution.
+                assert SudokuCSP(domains)._constraints_satisfied()
                 return domains
-            return None
+            stack.append([len(trail), var, domains[var]])
+
+            # Find the next value that survives propagation, backtracking as needed
+            while stack:
+                frame = stack[-1]
+                mark, var, values = frame
+
+                # Undo every change made since this frame was entered
+                while len(trail) > mark:
+                    i, mask = trail.pop()
+                    domains[i] = mask
+
+                if not values:
+                    stack.pop()
+                    continue
+
+                # Try values in ascending order; LCV rarely pays for itself on Sudoku.
+                bit = values & -values
+                frame[2] = values ^ bit
+                if self._assign(domains, trail, var, bit):
+                    break
+            else:
+                return None
 
-        var = self._select_unassigned_variable(domains)
-        if var is None:
-            return None
 
-        for val in self._order_domain_values(var, domains):
-            if not self._consistent(var, val, domains):
-                continue
+@lru_cache(maxsize=64)
+def _from_string_cached(puzzle: str) -> SudokuCSP:
+    """Parse and run AC-3 on a normalized puzzle; the result must not be mutated."""
+    cleaned = [ch for ch in puzzle if not ch.isspace()]
+    if len(cleaned) != 81:
+        raise ValueError("Puzzle must have exactly 81 non-whitespace characters")
 
-            new_domains = self._forward_check(var, val, domains)
-            if new_domains is None:
-                continue
+    domains: List[int] = []
+    for idx, ch in enumerate(cleaned):
+        if ch in "0.":
+            domains.append(ALL_DIGITS)
+        elif ch.isdigit() and ch != "0":
+            val = int(ch)
+            if not 1 <= val <= 9:
+                raise ValueError(f"Invalid digit {ch} at position {idx}")
+            domains.append(DIGIT_TO_BIT[val])
+        else:
+            raise ValueError(f"Invalid character {ch!r} in puzzle")
 
-            result = self._backtrack(new_domains, step_callback, step_interval, state)
-            if result is not None:
-                return result
+    csp = SudokuCSP(domains)
+    if not csp.ac3():
+        raise ValueError("Puzzle is immediately inconsistent under AC-3")
+    return csp
 
-        return None
+
+@lru_cache(maxsize=256)
+def _solve_string(puzzle: str) -> Optional[str]:
+    """Solve a normalized puzzle string; returns the 81-digit solution or None."""
+    solution = SudokuCSP.from_string(puzzle).solve()
+    return solution.to_string() if solution is not None else None
 
 
 def solve_puzzle(puzzle: str) -> Optional[SudokuCSP]:
-    csp = SudokuCSP.from_string(puzzle)
-    return csp.solve()
+    # Normalize so equivalent spellings of a puzzle share one cache entry
+    normalized = "".join(puzzle.split()).replace("0", ".")
+    solved = _solve_string(normalized)
+    if solved is None:
+        return None
+    return SudokuCSP([DIGIT_TO_BIT[int(ch)] for ch in solved])
 
 
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numba import njit
+
+# Upper bound on pending (cell, bit) eliminations during one propagation:
+# every real removal (at most 81 * 9) pushes at most 20 naked-single and
+# 3 * 8 hidden-single eliminations.
+_WORK_CAPACITY = 81 * 9 * (20 + 3 * 8) + 9
+
+
+def build_tables(
+    peers: Sequence[Sequence[int]],
+    row_peers: Sequence[Sequence[int]],
+    col_peers: Sequence[Sequence[int]],
+    box_peers: Sequence[Sequence[int]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack the peer tables into an (81, 20) and an (81, 3, 8) int8 array."""
+    peers_arr = np.array(peers, dtype=np.int8)
+    units_arr = np.array(
+        [[row_peers[i], col_peers[i], box_peers[i]] for i in range(81)], dtype=np.int8
+    )
+    return peers_arr, units_arr
+
+
+# Popcount of every 9-bit domain mask
+_POPCOUNT = np.array([bin(m).count("1") for m in range(512)], dtype=np.int8)
+
+
+@njit(cache=True)
+def _select_unassigned(doms: np.ndarray) -> int:
+    best = -1
+    best_size = 10
+    for i in range(81):
+        size = _POPCOUNT[doms[i]]
+        if 1 < size < best_size:
+            best = i
+            best_size = size
+            if size == 2:
+                break
+    return best
+
+
+@njit(cache=True)
+def _propagate(
+    doms: np.ndarray,
+    trail: np.ndarray,
+    tlen: int,
+    work: np.ndarray,
+    wlen: int,
+    peers: np.ndarray,
+    units: np.ndarray,
+) -> Tuple[bool, int]:
+    """Run the pending eliminations in ``work`` to a fixpoint.
+
+    Same rules as ``SudokuCSP._eliminate`` (naked and hidden singles), with an
+    explicit work stack instead of recursion.  Returns ``(ok, trail_length)``.
+    """
+    while wlen > 0:
+        wlen -= 1
+        var = work[wlen, 0]
+        bit = work[wlen, 1]
+        mask = doms[var]
+        if not mask & bit:
+            continue
+        trail[tlen, 0] = var
+        trail[tlen, 1] = mask
+        tlen += 1
+        mask &= ~bit
+        doms[var] = mask
+        if mask == 0:
+            return False, tlen
+
+        if mask & (mask - 1) == 0:
+            for k in range(20):
+                work[wlen, 0] = peers[var, k]
+                work[wlen, 1] = mask
+                wlen += 1
+
+        for u in range(3):
+            count = 0
+            place = -1
+            for k in range(8):
+                p = units[var, u, k]
+                if doms[p] & bit:
+                    count += 1
+                    place = p
+            if count == 0:
+                return False, tlen
+            if count == 1:
+                others = doms[place] & ~bit
+                while others:
+                    other = others & -others
+                    others ^= other
+                    work[wlen, 0] = place
+                    work[wlen, 1] = other
+                    wlen += 1
+    return True, tlen
+
+
+@njit(cache=True)
+def solve_nb(domains: np.ndarray, peers: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """Backtracking search over int16 bitmask domains.
+
+    Returns the solved domains, or an empty array if there is no solution.
+    """
+    doms = domains.copy()
+    # Along one search path domains only shrink, so at most 81 * 9 removals.
+    trail = np.empty((81 * 9, 2), dtype=np.int16)
+    work = np.empty((_WORK_CAPACITY, 2), dtype=np.int16)
+    stack_var = np.empty(81, dtype=np.int64)
+    stack_values = np.empty(81, dtype=np.int64)
+    stack_mark = np.empty(81, dtype=np.int64)
+
+    var = _select_unassigned(doms)
+    if var < 0:
+        return doms
+    stack_var[0] = var
+    stack_values[0] = doms[var]
+    stack_mark[0] = 0
+    depth = 1
+    tlen = 0
+
+    while depth > 0:
+        d = depth - 1
+        # Restore the domains this frame started from
+        mark = stack_mark[d]
+        while tlen > mark:
+            tlen -= 1
+            doms[trail[tlen, 0]] = trail[tlen, 1]
+
+        values = stack_values[d]
+        if values == 0:
+            depth -= 1
+            continue
+        bit = values & -values
+        stack_values[d] = values ^ bit
+
+        var = stack_var[d]
+        wlen = 0
+        others = doms[var] & ~bit
+        while others:
+            other = others & -others
+            others ^= other
+            work[wlen, 0] = var
+            work[wlen, 1] = other
+            wlen += 1
+
+        ok, tlen = _propagate(doms, trail, tlen, work, wlen, peers, units)
+        if not ok:
+            continue
+
+        var = _select_unassigned(doms)
+        if var < 0:
+            return doms
+        stack_var[depth] = var
+        stack_values[depth] = doms[var]
+        stack_mark[depth] = tlen
+        depth += 1
+
+    return doms[:0]
+
+
+def solve_domains(
+    domains: List[int], peers: np.ndarray, units: np.ndarray
+) -> Optional[List[int]]:
+    """Solve a list of 81 bitmask domains; None when unsatisfiable."""
+    result = solve_nb(np.array(domains, dtype=np.int16), peers, units)
+    if result.size == 0:
+        return None
+    return [int(m) for m in result]